@@ -18,10 +18,12 @@ The script has no external dependencies besides the Python standard library.
 import os
 import re
 import time
-import random
+from collections import Counter
+from functools import lru_cache
+from random import randint as _randint
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Tuple
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, List, Pattern, Tuple
 
 
 # -----------------------------------------------------------------------------
@@ -75,50 +77,98 @@ QUESTIONS: List[Dict[str, str]] = [
 # -----------------------------------------------------------------------------
 # Utility functions
 # -----------------------------------------------------------------------------
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
 def tokenize(text: str) -> List[str]:
     """Tokenize text into lowercase alphanumeric tokens."""
-    return re.findall(r"[a-z0-9]+", text.lower())
+    return _TOKEN_RE.findall(text.lower())
+
+
+# Token sets for each document are fixed, so build them once at import time
+# instead of re-tokenizing the whole corpus for every question.
+_DOC_TOKENS: List[FrozenSet[str]] = [
+    frozenset(tokenize(doc["text"] + " " + doc["title"])) for doc in CORPUS
+]
+
+# Inverted index mapping each token to the indices of the documents that
+# contain it, so retrieval only touches documents sharing a query token.
+_INVERTED: Dict[str, List[int]] = {}
+for _idx, _tokens in enumerate(_DOC_TOKENS):
+    for _token in _tokens:
+        _INVERTED.setdefault(_token, []).append(_idx)
+
+# Likewise for the questions: the lowercased text used by the answer
+# heuristics and the token set used for retrieval, parallel to QUESTIONS.
+_Q_LOWER: List[str] = [q["question"].lower() for q in QUESTIONS]
+_Q_TOKENS: List[FrozenSet[str]] = [frozenset(tokenize(q["question"])) for q in QUESTIONS]
 
 
-def retrieve(question: str) -> Dict[str, str]:
-    """Retrieve the most relevant document from the toy corpus based on keyword overlap."""
-    q_tokens = set(tokenize(question))
-    scored: List[Tuple[int, Dict[str, str]]] = []
-    for doc in CORPUS:
-        d_tokens = set(tokenize(doc["text"] + " " + doc["title"]))
-        score = len(q_tokens & d_tokens)
-        scored.append((score, doc))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return scored[0][1]
+@lru_cache(maxsize=256)
+def retrieve(q_tokens: FrozenSet[str]) -> Dict[str, str]:
+    """Retrieve the most relevant document from the toy corpus based on keyword overlap.
+
+    Results are memoized on the question's frozen token set, so repeated
+    questions skip the index lookup entirely.
+    """
+    counter: Counter = Counter()
+    for token in q_tokens:
+        counter.update(_INVERTED.get(token, ()))
+    if not counter:
+        return CORPUS[0]
+    # Highest overlap wins; ties go to the earliest document in the corpus.
+    best_idx, _ = max(counter.items(), key=lambda item: (item[1], -item[0]))
+    return CORPUS[best_idx]
+
+
+# Keyword patterns checked in order against the lowercased question, each
+# paired with its canned answer.
+_ANSWER_PATTERNS: List[Tuple[Pattern[str], str]] = [
+    (re.compile(r"groundedness"),
+     "It measures how much the answer relies on the provided context."),
+    (re.compile(r"reduce (?:inference )?cost"), "Use smaller models and caching."),
+    (re.compile(r"agentic rag"), "It adds planning and tool use."),
+]
 
 
 def answer_question(question: str, doc: Dict[str, str]) -> str:
-    """Generate a simple answer based on keyword heuristics."""
-    q = question.lower()
-    if "groundedness" in q:
-        return "It measures how much the answer relies on the provided context."
-    if "reduce inference cost" in q or "reduce inference cost" in q or "reduce cost" in q:
-        return "Use smaller models and caching."
-    if "agentic rag" in q:
-        return "It adds planning and tool use."
+    """Generate a simple answer based on keyword heuristics.
+
+    ``question`` must already be lowercased (see ``_Q_LOWER``); the keyword
+    patterns are matched against it as-is.
+    """
+    for pattern, answer in _ANSWER_PATTERNS:
+        if pattern.search(question):
+            return answer
     # fallback: return the first sentence of the retrieved document
-    return doc["text"].split(".")[0] + "."
+    return doc["text"].partition(".")[0] + "."
 
 
-def compute_groundedness(answer: str, context: str) -> float:
+def compute_groundedness(answer_tokens: List[str], context: str) -> float:
     """Compute a simple groundedness metric: fraction of answer tokens that appear in context."""
-    ans_tokens = tokenize(answer)
-    ctx_tokens = set(tokenize(context))
+    ans_tokens = sorted(answer_tokens)
+    ctx_tokens = sorted(set(tokenize(context)))
     if not ans_tokens:
         return 0.0
-    overlap = sum(1 for t in ans_tokens if t in ctx_tokens)
+    # Merge-join the two sorted token lists.  Answer tokens may repeat, so only
+    # advance the answer side on a match to count every occurrence.
+    overlap = 0
+    i = j = 0
+    while i < len(ans_tokens) and j < len(ctx_tokens):
+        if ans_tokens[i] == ctx_tokens[j]:
+            overlap += 1
+            i += 1
+        elif ans_tokens[i] < ctx_tokens[j]:
+            i += 1
+        else:
+            j += 1
     return overlap / len(ans_tokens)
 
 
-def simulate_latency_and_cost(answer: str) -> Tuple[int, float]:
-    """Simulate latency (ms) and cost (USD) based on answer length."""
-    tokens = max(1, len(tokenize(answer)))
-    latency = int(50 + 2.0 * tokens + random.randint(0, 20))
+def simulate_latency_and_cost(n_tokens: int) -> Tuple[int, float]:
+    """Simulate latency (ms) and cost (USD) based on answer length in tokens."""
+    tokens = max(1, n_tokens)
+    latency = int(50 + 2.0 * tokens + _randint(0, 20))
     cost = round(0.00001 * tokens, 6)
     return latency, cost
 
@@ -126,34 +176,54 @@ def simulate_latency_and_cost(answer: str) -> Tuple[int, float]:
 # -----------------------------------------------------------------------------
 # Main evaluation function
 # -----------------------------------------------------------------------------
-def evaluate() -> List[Dict[str, str]]:
-    """Evaluate all questions and return results as a list of dictionaries."""
-    results: List[Dict[str, str]] = []
-    for q in QUESTIONS:
-        doc = retrieve(q["question"])
-        ans = answer_question(q["question"], doc)
-        g = compute_groundedness(ans, doc["text"])
-        latency, cost = simulate_latency_and_cost(ans)
-        results.append({
-            "query_id": q["id"],
-            "question": q["question"],
-            "doc_id": doc["id"],
-            "answer": ans,
-            "groundedness": round(g, 3),
-            "latency_ms": latency,
-            "cost_usd": cost,
-        })
+def evaluate() -> Dict[str, list]:
+    """Evaluate all questions and return results as a dictionary of columns.
+
+    Each key maps to a list with one entry per question, so the numeric
+    columns can be reduced directly without walking per-row dictionaries.
+    """
+    results: Dict[str, list] = {
+        "query_id": [],
+        "question": [],
+        "doc_id": [],
+        "answer": [],
+        "groundedness": [],
+        "latency_ms": [],
+        "cost_usd": [],
+    }
+    for q, q_lower, q_tokens in zip(QUESTIONS, _Q_LOWER, _Q_TOKENS):
+        doc = retrieve(q_tokens)
+        ans = answer_question(q_lower, doc)
+        ans_tokens = tokenize(ans)
+        g = compute_groundedness(ans_tokens, doc["text"])
+        latency, cost = simulate_latency_and_cost(len(ans_tokens))
+        results["query_id"].append(q["id"])
+        results["question"].append(q["question"])
+        results["doc_id"].append(doc["id"])
+        results["answer"].append(ans)
+        results["groundedness"].append(round(g, 3))
+        results["latency_ms"].append(latency)
+        results["cost_usd"].append(cost)
     return results
 
 
-def write_report(results: List[Dict[str, str]], report_dir: Path) -> None:
+def write_report(results: Dict[str, list], report_dir: Path) -> None:
     """Write the evaluation results to a markdown file in the specified directory."""
-    date_str = datetime.utcnow().strftime("%Y-%m-%d")
+    date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     report_path = report_dir / f"{date_str}-ragops-eval.md"
-    # Compute averages
-    avg_g = sum(r["groundedness"] for r in results) / len(results)
-    avg_lat = sum(r["latency_ms"] for r in results) / len(results)
-    avg_cost = sum(r["cost_usd"] for r in results) / len(results)
+    groundedness = results["groundedness"]
+    latency_ms = results["latency_ms"]
+    cost_usd = results["cost_usd"]
+    # Compute averages in a single pass over the numeric columns
+    sum_g = sum_lat = sum_cost = 0.0
+    for g, latency, cost in zip(groundedness, latency_ms, cost_usd):
+        sum_g += g
+        sum_lat += latency
+        sum_cost += cost
+    n = len(groundedness)
+    avg_g = sum_g / n
+    avg_lat = sum_lat / n
+    avg_cost = sum_cost / n
     # Build markdown
     lines = [
         f"# RAGOps Evaluation – {date_str}",
@@ -167,15 +237,14 @@ def write_report(results: List[Dict[str, str]], report_dir: Path) -> None:
         "|Query|Doc|Groundedness|Latency (ms)|Cost (USD)|",
         "|---|---|---|---|---|",
     ]
-    for r in results:
-        lines.append(
-            f"|{r['query_id']}|{r['doc_id']}|{r['groundedness']:.3f}|{r['latency_ms']}|{r['cost_usd']:.6f}|"
-        )
+    for query_id, doc_id, g, latency, cost in zip(
+        results["query_id"], results["doc_id"], groundedness, latency_ms, cost_usd
+    ):
+        lines.append(f"|{query_id}|{doc_id}|{g:.3f}|{latency}|{cost:.6f}|")
     lines.append("")
     # Write to file
     report_dir.mkdir(parents=True, exist_ok=True)
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+    report_path.write_text("\n".join(lines), encoding="utf-8")
     print(f"Report written to {report_path}")
 
 